@@ -25,6 +25,8 @@ __author__ = 'chrispaulson'
 
 import os
 import math
+import shutil
+from functools import cached_property
 from pathlib import Path
 from typing import Optional
 import numpy as np
@@ -33,6 +35,10 @@ from PyFoam.Applications.Runner import Runner
 from PyFoam.Applications.MeshUtilityRunner import MeshUtilityRunner
 from . import Utilities
 
+## Below this many processors the decompose/reconstruct overhead of a parallel
+## snappyHexMesh outweighs the speedup, so it runs in serial unless asked otherwise
+MIN_PARALLEL_SNAPPY_PROCS = 4
+
 
 def which(program: str) -> Optional[str]:
     """
@@ -43,26 +49,11 @@ def which(program: str) -> Optional[str]:
 
     Returns:
         Full path to the executable if found, None otherwise.
-
-    Note:
-        Based on harmv's StackOverflow answer:
-        http://stackoverflow.com/questions/377017/test-if-executable-exists-in-python
     """
-    def is_exe(fpath: str) -> bool:
-        return os.path.isfile(fpath) and os.access(fpath, os.X_OK)
-
-    fpath, fname = os.path.split(program)
-    if fpath:
-        if is_exe(program):
-            return program
-    else:
-        for path in os.environ.get("PATH", "").split(os.pathsep):
-            path = path.strip('"')
-            exe_file = os.path.join(path, program)
-            if is_exe(exe_file):
-                return exe_file
-
-    return None
+    # shutil.which takes PATH entries literally, strip the quotes Windows installers
+    # often put around directories such as "C:\Program Files\ParaView\bin"
+    path = os.pathsep.join(p.strip('"') for p in os.environ.get('PATH', '').split(os.pathsep))
+    return shutil.which(program, path=path)
 
 
 class mesher:
@@ -114,36 +105,40 @@ class mesher:
             self.parallel = False
             self.nprocs = 1
 
-        # Load OpenFOAM dictionary files
-        self.blockMeshDict = ParsedParameterFile(
+    # The OpenFOAM dictionaries are parsed on first use, so a caller that only runs
+    # one meshing step (or runs in serial) never pays for parsing the others
+    @cached_property
+    def blockMeshDict(self) -> ParsedParameterFile:
+        """Parsed constant/polyMesh/blockMeshDict of the case."""
+        return ParsedParameterFile(
             str(self.casePath / 'constant' / 'polyMesh' / 'blockMeshDict')
         )
-        self.snappyHexMeshDict = ParsedParameterFile(
+
+    @cached_property
+    def snappyHexMeshDict(self) -> ParsedParameterFile:
+        """Parsed system/snappyHexMeshDict of the case."""
+        return ParsedParameterFile(
             str(self.casePath / 'system' / 'snappyHexMeshDict')
         )
-        self.decomposeParDict = ParsedParameterFile(
+
+    @cached_property
+    def decomposeParDict(self) -> ParsedParameterFile:
+        """Parsed system/decomposeParDict of the case, only needed for parallel runs."""
+        return ParsedParameterFile(
             str(self.casePath / 'system' / 'decomposeParDict')
         )
 
     def blockMeshDomain(self):
-        x_verts = []
-        y_verts = []
-        z_verts = []
-
         ## Get the vertices from the template blockmeshdict (this ranges from -1,1 for x,y and z)
-        for i in self.blockMeshDict['vertices']:
-            x_verts.append(i[0])
-            y_verts.append(i[1])
-            z_verts.append(i[2])
-        ##Based on the bounding box of the STL, calculate the domain (12 times the bb length in the downwind direction, 4 in the other two )
-        dx = (self.stlSolid.bb[1]-self.stlSolid.bb[0])*12
-        dy = (self.stlSolid.bb[3]-self.stlSolid.bb[2])*4
-        dz = (self.stlSolid.bb[5]-self.stlSolid.bb[4])*4
+        verts = np.asarray(self.blockMeshDict['vertices'], dtype=np.float64)
 
+        ##Based on the bounding box of the STL, calculate the domain (12 times the bb length in the downwind direction, 4 in the other two )
         ##Enfore some minimum size constraints if the STL geometry is small
-        if dx<2.5: dx = 2.5
-        if dy<2.5: dy = 2.5
-        if dz<2.5: dz = 2.5
+        bbx0, bbx1, bby0, bby1, bbz0, bbz1 = self.stlSolid.bb
+        lx = bbx1-bbx0
+        dx = max(12*lx, 2.5)
+        dy = max(4*(bby1-bby0), 2.5)
+        dz = max(4*(bbz1-bbz0), 2.5)
 
         ## Calculate the number of blocks in each direction based on the option baseCellSize of this class
         block_x = math.ceil(dx/float(self.baseCellSize))
@@ -153,13 +148,11 @@ class mesher:
         ## Set the block sizes in blockMeshDict
         self.blockMeshDict['blocks'][2] = [block_x, block_y, block_z]
 
-        ##Then scale the verts, also notice that the box is moved downwind a bit (the x_verts).
-        x_verts = (np.array(x_verts) * dx)+((self.stlSolid.bb[1]-self.stlSolid.bb[0])*6)
-        y_verts = np.array(y_verts) * dy
-        z_verts = np.array(z_verts) * dz
-        new_verts = []
-        for enu,i in enumerate(x_verts):
-            new_verts.append('(%f %f %f)'%(x_verts[enu],y_verts[enu],z_verts[enu]))
+        ##Then scale the verts in one pass, also notice that the box is moved downwind a bit (the x offset).
+        scale = np.array([dx, dy, dz])
+        offset = np.array([lx*6, 0.0, 0.0])
+        verts = verts * scale + offset
+        new_verts = ['(%f %f %f)' % tuple(row) for row in verts]
 
         #set the new verts in blockMeshDict
         self.blockMeshDict['vertices'] = new_verts
@@ -176,10 +169,20 @@ class mesher:
         Runner(args=["--silent","surfaceFeatureExtract","-case",self.casePath])
 
 
-    def snappyHexMesh(self):
+    def snappyHexMesh(self, parallel: Optional[bool] = None, nprocs: Optional[int] = None):
         '''
         This function runs snappyHexMesh for us
+
+        Args:
+            parallel: Decompose the case and run snappyHexMesh under MPI. By default this
+                happens when the mesher runs on MIN_PARALLEL_SNAPPY_PROCS or more processors.
+            nprocs: Number of subdomains for the parallel run, defaults to the mesher's.
         '''
+        nprocs = self.nprocs if nprocs is None else nprocs
+        if parallel is None:
+            parallel = self.parallel and nprocs >= MIN_PARALLEL_SNAPPY_PROCS
+        parallel = parallel and nprocs > 1
+
         ## First, lets add a few refinement regions based on the geometry
 
         ## The first is a box that surrounds the aircraft and extends downwind by three body lengths
@@ -187,8 +190,12 @@ class mesher:
         dwBox = self.snappyHexMeshDict['geometry']['downwindbox']
         dwBox['type'] = 'searchableBox'
         boxenlarge = 2.5
-        dwBox['min'] = [boxenlarge*self.stlSolid.bb[0],boxenlarge*self.stlSolid.bb[2],boxenlarge*self.stlSolid.bb[4]]
-        dwBox['max'] = [boxenlarge*self.stlSolid.bb[1]+4*(self.stlSolid.bb[1]-self.stlSolid.bb[0]),boxenlarge*self.stlSolid.bb[3],boxenlarge*self.stlSolid.bb[5]]
+        bb = np.asarray(self.stlSolid.bb, dtype=np.float64)
+        boxMin = boxenlarge*bb[0::2]
+        boxMax = boxenlarge*bb[1::2]
+        boxMax[0] += 4*(bb[1]-bb[0])
+        dwBox['min'] = boxMin.tolist()
+        dwBox['max'] = boxMax.tolist()
 
         self.snappyHexMeshDict['castellatedMeshControls']['refinementRegions']['downwindbox']={}
         self.snappyHexMeshDict['castellatedMeshControls']['refinementRegions']['downwindbox']['mode']='inside'
@@ -203,7 +210,8 @@ class mesher:
         wt1Box['type'] = 'searchableCylinder'
         wt1Box['point1'] = self.stlSolid.yminPoint.tolist()
         ## Next point is 6 meters downwind
-        wt1Box['point2'] = [sum(x) for x in zip(self.stlSolid.yminPoint, [6,0,0])]
+        downwind = np.array([6.0, 0.0, 0.0])
+        wt1Box['point2'] = (np.asarray(self.stlSolid.yminPoint) + downwind).tolist()
         wt1Box['radius'] = .2
 
         self.snappyHexMeshDict['castellatedMeshControls']['refinementRegions']['wingtip1']={}
@@ -216,7 +224,7 @@ class mesher:
         wt2Box['type'] = 'searchableCylinder'
         wt2Box['point1'] = self.stlSolid.ymaxPoint.tolist()
         ## Next point is 6 meters downwind
-        wt2Box['point2'] = [sum(x) for x in zip(self.stlSolid.ymaxPoint, [6,0,0])]
+        wt2Box['point2'] = (np.asarray(self.stlSolid.ymaxPoint) + downwind).tolist()
         wt2Box['radius'] = .2
 
 
@@ -224,13 +232,20 @@ class mesher:
         self.snappyHexMeshDict['castellatedMeshControls']['refinementRegions']['wingtip2']['mode']='inside'
         self.snappyHexMeshDict['castellatedMeshControls']['refinementRegions']['wingtip2']['levels'] = [[1,5]]
 
+        ## In parallel the cell limit applies per processor, so split the global budget between them
+        if parallel:
+            castellated = self.snappyHexMeshDict['castellatedMeshControls']
+            castellated['maxLocalCells'] = int(castellated['maxGlobalCells']) // nprocs
+
         ## Save the snappyHexMeshDict file
         self.snappyHexMeshDict.writeFile()
 
         ## We need to know if we should run this in parallel
-        if self.parallel:
+        if parallel:
             ## Ok, running in parallel. Lets first configure the decomposePar dict based on the number of processors we have
-            self.decomposeParDict['numberOfSubdomains'] = self.nprocs
+            ## scotch needs no geometric input and balances the subdomains itself
+            self.decomposeParDict['numberOfSubdomains'] = nprocs
+            self.decomposeParDict['method'] = 'scotch'
             self.decomposeParDict.writeFile()
             ## The we decompose the case (Split up the problem into a few subproblems)
             Runner(args=['--silent',"decomposePar","-force","-case",self.casePath])
@@ -238,7 +253,7 @@ class mesher:
             ## Then run snappyHexMesh to build our final mesh for the simulation, also in parallel
             print("Starting snappyHexMesh")
             # Runner(args=['--silent', "--proc=%s"%self.nprocs,"snappyHexMesh","-overwrite","-case",str(self.casePath)])
-            Runner(args=[f"--proc={self.nprocs}","snappyHexMesh","-overwrite","-case",str(self.casePath)])
+            Runner(args=[f"--proc={nprocs}","snappyHexMesh","-overwrite","-case",str(self.casePath)])
             ## Finally, we combine the mesh back into a single mesh. This allows us to decompose it more intelligently for simulation
 
             Runner(args=['--silent', "reconstructParMesh","-constant","-case",self.casePath])
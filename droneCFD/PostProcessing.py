@@ -19,11 +19,240 @@ __author__ = 'chrispaulson'
 import re
 import os
 import math
-import glob
+import mmap
+import warnings
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from itertools import zip_longest
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
 import numpy as np
 import xlsxwriter
+from xlsxwriter.utility import xl_col_to_name
+from . import Utilities
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+## forces.dat columns kept by the parser: time, pressure/viscous x force (drag) and
+## pressure/viscous z force (lift)
+_FORCE_COLUMNS = (0, 1, 4, 3, 6)
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _scanFloat(buf, i, n):
+        """Skip one ASCII float token starting at buf[i]; returns (next index, valid)."""
+        if buf[i] == 45 or buf[i] == 43:  # '-' or '+'
+            i += 1
+        digits = 0
+        while i < n and 48 <= buf[i] <= 57:
+            digits += 1
+            i += 1
+        if i < n and buf[i] == 46:  # '.'
+            i += 1
+            while i < n and 48 <= buf[i] <= 57:
+                digits += 1
+                i += 1
+        valid = digits > 0
+        if valid and i < n and (buf[i] == 101 or buf[i] == 69):  # 'e' or 'E'
+            i += 1
+            if i < n and (buf[i] == 45 or buf[i] == 43):
+                i += 1
+            expDigits = 0
+            while i < n and 48 <= buf[i] <= 57:
+                expDigits += 1
+                i += 1
+            valid = expDigits > 0
+        # Anything other than a delimiter here means the token is not a number
+        while i < n and not (buf[i] == 32 or buf[i] == 9 or buf[i] == 10 or buf[i] == 13
+                             or buf[i] == 40 or buf[i] == 41):
+            valid = False
+            i += 1
+        return i, valid
+
+    @njit(cache=True)
+    def _gatherForceTokens(buf, ncols, columns):
+        """
+        Copy the wanted columns of every valid forces.dat row into a fixed width token block.
+
+        Returns a (rows, len(columns), width) uint8 array holding the tokens NUL padded,
+        ready to be viewed as a bytes array and converted to floats by NumPy.
+        """
+        n = buf.shape[0]
+        # The line count bounds the number of rows, so the outputs never need to grow
+        nlines = 1
+        for i in range(n):
+            if buf[i] == 10:
+                nlines += 1
+        ncolumns = len(columns)
+        starts = np.empty((nlines, ncolumns), dtype=np.int64)
+        ends = np.empty((nlines, ncolumns), dtype=np.int64)
+        rowStarts = np.empty(ncols, dtype=np.int64)
+        rowEnds = np.empty(ncols, dtype=np.int64)
+        width = 1
+        row = 0
+        i = 0
+        while i < n:
+            if buf[i] == 35:  # '#' comment line
+                while i < n and buf[i] != 10:
+                    i += 1
+                i += 1
+                continue
+            col = 0
+            ok = True
+            while i < n and buf[i] != 10:
+                c = buf[i]
+                if c == 32 or c == 9 or c == 13 or c == 40 or c == 41:
+                    i += 1
+                    continue
+                start = i
+                i, valid = _scanFloat(buf, i, n)
+                if not valid:
+                    ok = False
+                elif col < ncols:
+                    rowStarts[col] = start
+                    rowEnds[col] = i
+                col += 1
+            i += 1
+            if ok and col == ncols:
+                for k in range(ncolumns):
+                    starts[row, k] = rowStarts[columns[k]]
+                    ends[row, k] = rowEnds[columns[k]]
+                    width = max(width, ends[row, k] - starts[row, k])
+                row += 1
+
+        tokens = np.zeros((row, ncolumns, width), dtype=np.uint8)
+        for r in range(row):
+            for k in range(ncolumns):
+                for j in range(ends[r, k] - starts[r, k]):
+                    tokens[r, k, j] = buf[starts[r, k] + j]
+        return tokens
+
+
+def _rowWidth(buf) -> int:
+    """Return the number of values on the first data line of a forces.dat buffer."""
+    start = 0
+    while start < len(buf):
+        end = buf.find(b'\n', start)
+        if end == -1:
+            end = len(buf)
+        line = buf[start:end]
+        if line.strip() and not line.startswith(b'#'):
+            return len(line.translate(None, b'()').split())
+        start = end + 1
+    return 0
+
+
+def _readForces(forces_file: Path) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Parse an OpenFOAM forces.dat log into time, drag and lift histories.
+
+    The file is memory-mapped rather than copied through Python buffers. When
+    Numba is installed the mapped bytes are scanned by a JIT-compiled tokenizer that
+    only keeps the time and x/z force columns, so the full force/moment table is
+    never materialized, and NumPy converts those tokens to floats. Otherwise
+    parentheses are stripped byte-wise as
+    lines are streamed, NumPy parses all rows at once and the columns are summed
+    afterwards. Comment lines, rows with the wrong number of columns and rows that
+    cannot be converted to floats are skipped.
+
+    Args:
+        forces_file: Path to the forces.dat file.
+
+    Returns:
+        Tuple of (time, drag, lift) arrays with one entry per time step, all empty
+        if no valid rows exist.
+    """
+    empty = np.empty(0)
+
+    # mmap refuses zero-length files
+    if forces_file.stat().st_size == 0:
+        return empty, empty, empty
+
+    with open(forces_file, 'rb') as pipefile, \
+            mmap.mmap(pipefile.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if NUMBA_AVAILABLE:
+            ncols = _rowWidth(mm)
+            if ncols <= 10:
+                return empty, empty, empty
+            buf = np.frombuffer(mm, dtype=np.uint8)
+            try:
+                tokens = _gatherForceTokens(buf, ncols, np.array(_FORCE_COLUMNS))
+            finally:
+                # The view has to be released before the mapping can be closed
+                del buf
+            # NumPy's bytes to float cast rounds correctly, so the values match the
+            # genfromtxt path below bit for bit
+            values = tokens.view(f'S{tokens.shape[2]}')[..., 0].astype(np.float64)
+            return values[:, 0], values[:, 1] + values[:, 2], values[:, 3] + values[:, 4]
+
+        with warnings.catch_warnings():
+            # genfromtxt warns about empty input and skipped rows, both are expected here
+            warnings.simplefilter('ignore')
+            data = np.genfromtxt(
+                (line.translate(None, b'()') for line in iter(mm.readline, b'')),
+                dtype=np.float64,
+                comments='#',
+                invalid_raise=False,
+                ndmin=2
+            )
+
+    # Only full force/moment rows are usable (time + 9 forces + 9 moments)
+    if data.shape[1] <= 10:
+        return empty, empty, empty
+    data = data[~np.isnan(data).any(axis=1)]
+    return data[:, 0], data[:, 1] + data[:, 4], data[:, 3] + data[:, 6]
+
+
+def _processCase(aoa_path: str | Path) -> Optional[dict]:
+    """
+    Read and reduce the forces log of a single AOA case.
+
+    This is a module-level function so it can be dispatched to worker processes.
+
+    Args:
+        aoa_path: Path to the AOA case directory, named like ``aoa_<angle>``.
+
+    Returns:
+        Dictionary with the angle, the time/drag/lift histories and the time-averaged
+        lift and drag in the aircraft reference frame, or None if no forces data exists.
+    """
+    aoa_path = Path(aoa_path)
+    aoatmp = float(aoa_path.name.split('_')[-1])
+    # One print per case keeps output from concurrent workers from interleaving
+    print(f"  AOA case: {aoa_path}\n  Angle: {aoatmp}")
+
+    # Read forces data
+    forces_file = aoa_path / 'postProcessing' / 'forces' / '0' / 'forces.dat'
+    if not forces_file.exists():
+        print(f"  Warning: Forces file not found: {forces_file}")
+        return None
+
+    # Drag and lift histories (pressure + viscous)
+    time, drag, lift = _readForces(forces_file)
+    if len(time) == 0:
+        print(f"  Warning: No valid data found in {forces_file}")
+        return None
+
+    # Calculate time-averaged forces (last 15 iterations)
+    avgLength = min(15, len(time))
+    zForce = lift[-avgLength:].mean()
+    xForce = drag[-avgLength:].mean()
+    a = math.sin(math.radians(aoatmp))
+    b = math.cos(math.radians(aoatmp))
+
+    # Transform to aircraft reference frame
+    return {
+        'aoa': aoatmp,
+        'time': time,
+        'drag': drag,
+        'lift': lift,
+        'planeRefLift': b * zForce + a * xForce,
+        'planeRefDrag': b * xForce - a * zForce,
+    }
 
 
 class PostProcessing:
@@ -36,85 +265,99 @@ class PostProcessing:
     Attributes:
         casedir: Path to the case directory containing simulation results.
         parserArgs: Optional command-line arguments.
+        procsUtil: Parallel configuration used to size the case worker pool, None when
+            the cases are read serially.
     """
 
-    def __init__(self, casedir: str | Path, parserArgs=None) -> None:
+    def __init__(
+        self,
+        casedir: str | Path,
+        parserArgs=None,
+        *,
+        nprocs: Optional[int] = None
+    ) -> None:
         """
         Initialize post-processing and generate reports.
 
         Args:
             casedir: Path to the case directory or parent directory containing multiple cases.
             parserArgs: Optional command-line parser arguments.
+            nprocs: Number of worker processes used to read the AOA cases (optional). The
+                cases are read serially unless this is given. Worker processes need the
+                calling script to be import safe (an ``if __name__ == '__main__'`` guard)
+                under the spawn start method; if the pool cannot start, the cases are read
+                serially instead.
         """
         self.casedir = Path(casedir)
         self.parserArgs = parserArgs
-        workbook = xlsxwriter.Workbook(str(self.casedir / 'RunSummary.xlsx'))
+        self.procsUtil = Utilities.parallelUtilities(nprocs) if nprocs is not None else None
+
+        # constant_memory flushes each row to disk as soon as the next one is started,
+        # so every worksheet below is written strictly row by row
+        workbook = xlsxwriter.Workbook(
+            str(self.casedir / 'RunSummary.xlsx'),
+            {'constant_memory': True}
+        )
         globalResults = workbook.add_worksheet('Global Results')
         chartGR = workbook.add_chart({'type': 'scatter', 'subtype': 'straight'})
         grRow = 0
         grCol = 0
 
-        for set_path in glob.glob(str(self.casedir)):
+        set_paths = [self.casedir] if self.casedir.is_dir() else []
+        for set_path in set_paths:
             print(f"Processing: {set_path}")
-            if not os.path.isdir(set_path):
-                continue
 
-            run = Path(set_path).name
+            run = set_path.name
             worksheet = workbook.add_worksheet(run)
-            column = 0
-            row = 0
             chartLift = workbook.add_chart({'type': 'scatter', 'subtype': 'straight'})
             chartDrag = workbook.add_chart({'type': 'scatter', 'subtype': 'straight'})
 
-            for aoa_path in glob.glob(f'{set_path}/*'):
-                print(f"  AOA case: {aoa_path}")
-                aoatmp = float(Path(aoa_path).name.split('_')[-1])
-                print(f"  Angle: {aoatmp}")
-
-                # Write headers
-                worksheet.write(row, column, f'{aoatmp} Simulation Time')
-                worksheet.write(row, column + 1, f'{aoatmp} Drag')
-                worksheet.write(row, column + 2, f'{aoatmp} Lift')
-                row += 1
-
-                # Read forces data
-                forces_file = Path(aoa_path) / 'postProcessing' / 'forces' / '0' / 'forces.dat'
-                if not forces_file.exists():
-                    print(f"  Warning: Forces file not found: {forces_file}")
-                    continue
-
-                data = []
-                with open(forces_file, 'r') as pipefile:
-                    for line in pipefile:
-                        # Remove parentheses for parsing
-                        line = line.translate(str.maketrans('', '', '()'))
-                        lineData = line.split()
-                        if len(lineData) > 10:
-                            try:
-                                data.append(np.array(lineData, dtype='float'))
-                            except ValueError:
-                                continue  # Skip invalid lines
-
-                if not data:
-                    print(f"  Warning: No valid data found in {forces_file}")
-                    continue
-
-                data = np.array(data)
-                # Get cell references for chart creation
-                startCellTime = xlsxwriter.utility.xl_rowcol_to_cell(row, column, row_abs=True, col_abs=True)
-                startCellDrag = xlsxwriter.utility.xl_rowcol_to_cell(row, column + 1, row_abs=True, col_abs=True)
-                startCellLift = xlsxwriter.utility.xl_rowcol_to_cell(row, column + 2, row_abs=True, col_abs=True)
-
-                # Write force data
-                for i in data:
-                    worksheet.write(row, column, i[0])  # Time
-                    worksheet.write(row, column + 1, i[1] + i[4])  # Drag (pressure + viscous)
-                    worksheet.write(row, column + 2, i[3] + i[6])  # Lift (pressure + viscous)
-                    row += 1
-
-                endCellTime = xlsxwriter.utility.xl_rowcol_to_cell(row - 1, column, row_abs=True, col_abs=True)
-                endCellDrag = xlsxwriter.utility.xl_rowcol_to_cell(row - 1, column + 1, row_abs=True, col_abs=True)
-                endCellLift = xlsxwriter.utility.xl_rowcol_to_cell(row - 1, column + 2, row_abs=True, col_abs=True)
+            # scandir hands back the dirent type, so is_dir() needs no extra stat
+            with os.scandir(set_path) as it:
+                aoa_entries = [entry for entry in it if entry.is_dir()]
+
+            # Reduce every AOA case before writing anything to the worksheet
+            aoa_paths = [entry.path for entry in aoa_entries]
+            results = None
+            if self.procsUtil is not None and self.procsUtil.procs > 1 and len(aoa_paths) > 1:
+                try:
+                    with ProcessPoolExecutor(max_workers=min(self.procsUtil.procs, len(aoa_paths))) as executor:
+                        futures = [executor.submit(_processCase, aoa_path) for aoa_path in aoa_paths]
+                        results = [future.result() for future in as_completed(futures)]
+                except BrokenProcessPool as e:
+                    print(f"  Warning: Case worker pool failed ({e}), reading cases serially")
+            if results is None:
+                results = [_processCase(aoa_path) for aoa_path in aoa_paths]
+            cases = sorted((case for case in results if case is not None), key=lambda case: case['aoa'])
+
+            # Write headers
+            header = []
+            for case in cases:
+                aoatmp = case['aoa']
+                header += [f'{aoatmp} Simulation Time', f'{aoatmp} Drag', f'{aoatmp} Lift']
+            worksheet.write_row(0, 0, header)
+
+            # Write force data, one worksheet row at a time across all AOA cases. Cases that
+            # have run out of time steps are padded with None, which leaves the cells empty.
+            histories = [
+                zip(case['time'].tolist(), case['drag'].tolist(), case['lift'].tolist())
+                for case in cases
+            ]
+            for row, rowCases in enumerate(zip_longest(*histories, fillvalue=(None, None, None)), 1):
+                worksheet.write_row(row, 0, [value for values in rowCases for value in values])
+
+            for index, case in enumerate(cases):
+                aoatmp = case['aoa']
+                column = 3 * index
+                lastRow = len(case['time'])
+
+                # Get cell references for chart creation (data starts on the second sheet row)
+                colTime = xl_col_to_name(column)
+                colDrag = xl_col_to_name(column + 1)
+                colLift = xl_col_to_name(column + 2)
+                startCellTime, endCellTime = f'${colTime}$2', f'${colTime}${lastRow + 1}'
+                startCellDrag, endCellDrag = f'${colDrag}$2', f'${colDrag}${lastRow + 1}'
+                startCellLift, endCellLift = f'${colLift}$2', f'${colLift}${lastRow + 1}'
 
                 # Add series to charts
                 chartLift.add_series({
@@ -128,25 +371,8 @@ class PostProcessing:
                     'values': f'={run}!{startCellDrag}:{endCellDrag}'
                 })
 
-                # Move to next column set
-                column += 3
-                row = 0
-
-                # Calculate time-averaged forces (last 15 iterations)
-                avgLength = min(15, len(data))
-                a = math.sin(math.radians(aoatmp))
-                b = math.cos(math.radians(aoatmp))
-                zForce = np.mean(data[-avgLength:, 3] + data[-avgLength:, 6])
-                xForce = np.mean(data[-avgLength:, 1] + data[-avgLength:, 4])
-
-                # Transform to aircraft reference frame
-                planeRefLift = b * zForce + a * xForce
-                planeRefDrag = b * xForce - a * zForce
-
                 # Write global results
-                globalResults.write(grRow, grCol, aoatmp)
-                globalResults.write(grRow, grCol + 1, planeRefLift)
-                globalResults.write(grRow, grCol + 2, planeRefDrag)
+                globalResults.write_row(grRow, grCol, (aoatmp, case['planeRefLift'], case['planeRefDrag']))
                 grRow += 1
 
             # Update column for next set
@@ -22,7 +22,9 @@ __author__ = 'chrispaulson'
 
 import os
 import shutil
-import glob
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property
 from pathlib import Path
 from typing import Optional
 from PyFoam.RunDictionary.ParsedParameterFile import ParsedParameterFile
@@ -30,6 +32,47 @@ from PyFoam.Applications.Runner import Runner
 from PyFoam.Applications.PlotRunner import PlotRunner
 from . import Utilities
 
+# Parsed dictionaries kept between solver runs, keyed by path. Each entry records the
+# (mtime, size) of the file it was parsed from so out-of-band edits force a re-parse.
+_PARSED_CACHE: OrderedDict = OrderedDict()
+_PARSED_CACHE_SIZE = 16
+
+
+def _fileStamp(path: Path) -> tuple:
+    """Return the (mtime, size) pair used to validate cached parses."""
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _loadParsedFile(path: Path) -> ParsedParameterFile:
+    """
+    Return a parsed OpenFOAM dictionary, reusing a cached parse if the file is unchanged.
+
+    Args:
+        path: Path to the dictionary file.
+
+    Returns:
+        ParsedParameterFile for the path.
+    """
+    key = str(path)
+    stamp = _fileStamp(path)
+    cached = _PARSED_CACHE.get(key)
+    if cached is not None and cached[0] == stamp:
+        _PARSED_CACHE.move_to_end(key)
+        return cached[1]
+
+    parsed = ParsedParameterFile(key)
+    _PARSED_CACHE[key] = (stamp, parsed)
+    if len(_PARSED_CACHE) > _PARSED_CACHE_SIZE:
+        _PARSED_CACHE.popitem(last=False)
+    return parsed
+
+
+def _writeParsedFile(path: Path, parsed: ParsedParameterFile) -> None:
+    """Write a dictionary from _loadParsedFile and refresh its cache stamp."""
+    parsed.writeFile()
+    _PARSED_CACHE[str(path)] = (_fileStamp(path), parsed)
+
 
 class solver:
     """
@@ -60,9 +103,6 @@ class solver:
         """
         self.casePath = Path(casedir)
         self.procsUtil = Utilities.parallelUtilities(nprocs)
-        self.decomposeParDict = ParsedParameterFile(
-            str(self.casePath / 'system' / 'decomposeParDict')
-        )
 
         if parserArgs:
             self.modifyDicts(parserArgs)
@@ -79,8 +119,7 @@ class solver:
         # Run the solver
         if self.parallel:
             # Clean up any existing processor directories
-            for file in glob.glob(str(self.casePath / 'processor*')):
-                shutil.rmtree(file)
+            self.removeProcessorDirs()
 
             # Decompose the case for parallel processing
             Runner(args=["decomposePar", "-case", str(self.casePath)])
@@ -110,12 +149,31 @@ class solver:
             Runner(args=["reconstructPar", "-case", str(self.casePath)])
 
             # Clean up processor directories
-            for file in glob.glob(str(self.casePath / 'processor*')):
-                shutil.rmtree(file)
+            self.removeProcessorDirs()
         else:
             # Run simpleFoam in serial mode
             runner = Runner(args=["simpleFoam", "-case", str(self.casePath)])
 
+    @cached_property
+    def decomposeParDict(self) -> ParsedParameterFile:
+        """Parsed system/decomposeParDict of the case, only loaded for parallel runs."""
+        return ParsedParameterFile(
+            str(self.casePath / 'system' / 'decomposeParDict')
+        )
+
+    def removeProcessorDirs(self) -> None:
+        """
+        Delete the processorN directories left by decomposePar.
+
+        The trees are removed concurrently since rmtree spends its time in
+        unlink/rmdir syscalls, which release the GIL.
+        """
+        processorDirs = list(self.casePath.glob('processor*'))
+        if not processorDirs:
+            return
+        with ThreadPoolExecutor(max_workers=min(32, self.nprocs, len(processorDirs))) as executor:
+            list(executor.map(shutil.rmtree, processorDirs))
+
     def modifyDicts(self, parserArgs) -> None:
         """
         Modify OpenFOAM dictionaries based on command-line arguments.
@@ -123,30 +181,35 @@ class solver:
         Args:
             parserArgs: Parsed command-line arguments containing simulation parameters.
         """
+        # controlDict is touched by several options, so parse it once and write it once
+        controlDict = ParsedParameterFile(str(self.casePath / 'system' / 'controlDict'))
+        controlDictModified = False
+
         # Modify airspeed if provided
         if hasattr(parserArgs, 'airspeed') and parserArgs.airspeed:
-            file = ParsedParameterFile(str(self.casePath / '0' / 'U'))
+            uPath = self.casePath / '0' / 'U'
+            file = _loadParsedFile(uPath)
             file['internalField'].val.vals[0] = parserArgs.airspeed
-            file.writeFile()
+            _writeParsedFile(uPath, file)
 
-            file = ParsedParameterFile(str(self.casePath / 'system' / 'controlDict'))
-            file['functions']['forces']['magUInf'] = parserArgs.airspeed
-            file['functions']['forceCoeffs1']['magUInf'] = parserArgs.airspeed
-            file.writeFile()
+            controlDict['functions']['forces']['magUInf'] = parserArgs.airspeed
+            controlDict['functions']['forceCoeffs1']['magUInf'] = parserArgs.airspeed
+            controlDictModified = True
 
         # Modify center of gravity if provided
         if hasattr(parserArgs, 'cofg') and parserArgs.cofg:
-            file = ParsedParameterFile(str(self.casePath / 'system' / 'controlDict'))
-            file['functions']['forces']['CofR'].vals[0] = parserArgs.cofg
-            file['functions']['forceCoeffs1']['CofR'].vals[0] = parserArgs.cofg
-            file.writeFile()
+            controlDict['functions']['forces']['CofR'].vals[0] = parserArgs.cofg
+            controlDict['functions']['forceCoeffs1']['CofR'].vals[0] = parserArgs.cofg
+            controlDictModified = True
 
         # Modify reference area if provided
         if hasattr(parserArgs, 'refarea') and parserArgs.refarea:
-            file = ParsedParameterFile(str(self.casePath / 'system' / 'controlDict'))
-            file['functions']['forces']['Aref'] = parserArgs.refarea
-            file['functions']['forceCoeffs1']['Aref'] = parserArgs.refarea
-            file.writeFile()
+            controlDict['functions']['forces']['Aref'] = parserArgs.refarea
+            controlDict['functions']['forceCoeffs1']['Aref'] = parserArgs.refarea
+            controlDictModified = True
+
+        if controlDictModified:
+            controlDict.writeFile()
 
         # Modify convergence criteria if provided
         if hasattr(parserArgs, 'convergence') and parserArgs.convergence:
@@ -9,6 +9,9 @@ This module provides utilities for:
 Classes:
     caseSetup: Manages OpenFOAM case directory setup.
     parallelUtilities: Manages parallel processing configuration.
+
+Functions:
+    availableCores: Number of cores usable by the current process.
 """
 
 ##########################################################################################
@@ -25,12 +28,128 @@ __author__ = 'chrispaulson'
 
 import shutil
 import os
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 import multiprocessing
 from . import stlTools
 
 
+## Template parts that droneCFD or OpenFOAM rewrite in place. A hardlinked case gets its own
+## copy of these so writes never reach the template through a shared inode.
+_REWRITTEN_PATHS = (
+    '0',
+    'system',
+    Path('constant') / 'polyMesh',
+    ## The aircraft STL is saved here and snappyHexMesh writes its feature edge meshes here
+    Path('constant') / 'triSurface',
+)
+
+
+def _linkCopytree(src: Path, dst: Path) -> None:
+    """
+    Copy a directory tree by hardlinking its files, except those under _REWRITTEN_PATHS.
+
+    Files that can't be linked (e.g. across filesystems) are copied instead.
+
+    Args:
+        src: Directory to copy.
+        dst: Destination directory, must not exist yet.
+    """
+    rewritten = tuple(os.path.join(src, p, '') for p in _REWRITTEN_PATHS)
+
+    def linkOrCopy(srcFile: str, dstFile: str) -> None:
+        if not srcFile.startswith(rewritten):
+            try:
+                os.link(srcFile, dstFile)
+                return
+            except OSError:
+                pass
+        shutil.copy(srcFile, dstFile)
+
+    shutil.copytree(src, dst, copy_function=linkOrCopy)
+
+
+def _parallelCopytree(src: Path, dst: Path) -> None:
+    """
+    Copy a directory tree with the file copies spread over a thread pool.
+
+    The tree is walked with os.scandir, whose entries carry the file type from the
+    directory listing, and the directory skeleton is created up front in the calling
+    thread. Only the file copies, which are syscall bound and release the GIL, run in
+    parallel. Symlinks are recreated rather than followed, as in shutil.copytree.
+
+    Args:
+        src: Directory to copy.
+        dst: Destination directory, must not exist yet.
+    """
+    files = []
+    # Missing parents of the root are created too, as shutil.copytree does
+    os.makedirs(dst)
+    pending = [(os.fspath(src), os.fspath(dst))]
+    while pending:
+        srcDir, dstDir = pending.pop()
+        with os.scandir(srcDir) as it:
+            for entry in it:
+                target = os.path.join(dstDir, entry.name)
+                if entry.is_symlink():
+                    os.symlink(os.readlink(entry.path), target)
+                elif entry.is_dir():
+                    os.mkdir(target)
+                    pending.append((entry.path, target))
+                else:
+                    files.append((entry.path, target))
+
+    with ThreadPoolExecutor(max_workers=min(16, availableCores())) as ex:
+        # list() drains the iterator so any copy error is raised here
+        list(ex.map(lambda pair: shutil.copy(*pair), files))
+
+
+def _fastCopytree(src: Path, dst: Path) -> None:
+    """
+    Copy a directory tree using the fastest tool available on the platform.
+
+    On Windows robocopy copies files with multiple threads, on Linux ``cp -a
+    --reflink=auto`` clones files on copy-on-write filesystems. If neither applies
+    or the tool fails, the tree is copied with a thread pool, and as a last resort with
+    shutil.copytree, in both cases without the per-file copystat calls.
+
+    Args:
+        src: Directory to copy.
+        dst: Destination directory, must not exist yet.
+    """
+    if sys.platform == 'win32' and shutil.which('robocopy'):
+        result = subprocess.run(
+            ['robocopy', str(src), str(dst), '/MT:16', '/E', '/NFL', '/NDL', '/NJH', '/NJS'],
+            stdout=subprocess.DEVNULL,
+        )
+        # robocopy exit codes below 8 all mean success
+        if result.returncode < 8:
+            return
+    elif sys.platform.startswith('linux') and shutil.which('cp'):
+        dst.mkdir(parents=True)
+        result = subprocess.run(
+            ['cp', '-a', '--reflink=auto', f'{src}{os.sep}.', str(dst)],
+            stderr=subprocess.DEVNULL,
+        )
+        if result.returncode == 0:
+            return
+
+    # Portable fallbacks, clear out anything a failed copy left behind
+    if dst.exists():
+        shutil.rmtree(dst)
+    try:
+        _parallelCopytree(src, dst)
+        return
+    except OSError:
+        if dst.exists():
+            shutil.rmtree(dst)
+    shutil.copytree(src, dst, copy_function=shutil.copy)
+
+
 class caseSetup:
     """
     Manages OpenFOAM case directory setup.
@@ -54,7 +173,9 @@ class caseSetup:
         folderPath: str | Path,
         geometryPath: Optional[str | Path] = None,
         templatePath: Optional[str | Path] = None,
-        parserArgs=None
+        parserArgs=None,
+        moveTemplate: bool = False,
+        copyFunction: Optional[Callable[[str, str], object]] = None
     ) -> None:
         """
         Initialize case setup and create directory structure.
@@ -64,6 +185,12 @@ class caseSetup:
             geometryPath: Path to the STL geometry file (optional).
             templatePath: Path to the OpenFOAM case template (optional).
             parserArgs: Command-line parser arguments (optional).
+            moveTemplate: If True, templatePath is a disposable scratch copy that may be
+                moved into place with a rename instead of copied. Ignored for the
+                packaged template.
+            copyFunction: Per-file copy function for the template, as for
+                shutil.copytree (optional). Pass os.link to hardlink the template files
+                into the case, see copyTemplate.
 
         Raises:
             ValueError: If folderPath is None.
@@ -100,7 +227,8 @@ class caseSetup:
         self.polyMesh = Path('polyMesh')
 
         # Copy template directory
-        self.copyTemplate(self.templatePath)
+        self.copyTemplate(self.templatePath, move=moveTemplate and templatePath is not None,
+                          copyFunction=copyFunction)
 
         # Set geometry if supplied
         if geometryPath:
@@ -108,12 +236,25 @@ class caseSetup:
             self.setGeometry(self.geometryPath)
 
 
-    def copyTemplate(self, path: Path) -> None:
+    def copyTemplate(
+        self,
+        path: Path,
+        move: bool = False,
+        copyFunction: Optional[Callable[[str, str], object]] = None
+    ) -> None:
         """
         Copy the OpenFOAM case template to the case directory.
 
         Args:
             path: Path to the template directory.
+            move: Move the template instead of copying it when it lives on the same
+                filesystem as the case directory. The template is consumed.
+            copyFunction: Per-file copy function passed to shutil.copytree, by default
+                the fastest available whole-tree copy is used. With os.link the files
+                are hardlinked (copied where linking fails), except the ones that are
+                rewritten in place (0/, system/, constant/polyMesh and
+                constant/triSurface), which get private copies so the template is
+                never modified.
 
         Raises:
             FileNotFoundError: If template path doesn't exist.
@@ -132,8 +273,26 @@ class caseSetup:
                 'Template is not of the correct form. Must contain constant/triSurface and system directories.'
             )
 
+        # A rename within one filesystem is O(1), regardless of the template size
+        if move:
+            self.dir.parent.mkdir(parents=True, exist_ok=True)
+            if os.stat(path).st_dev == os.stat(self.dir.parent).st_dev:
+                path.rename(self.dir)
+                print(f'Moved template from {path} to {self.dir}')
+                return
+
+        # Hardlink the template, apart from the files that get rewritten in place
+        if copyFunction is os.link:
+            _linkCopytree(path, self.dir)
+            print(f'Linked template from {path} to {self.dir}')
+            return
+        if copyFunction is not None:
+            shutil.copytree(path, self.dir, copy_function=copyFunction)
+            print(f'Copied template from {path} to {self.dir}')
+            return
+
         # Copy template directory
-        shutil.copytree(path, self.dir)
+        _fastCopytree(path, self.dir)
         print(f'Copied template from {path} to {self.dir}')
 
     def setGeometry(self, path: Path) -> None:
@@ -153,9 +312,9 @@ class caseSetup:
         if not path.is_file():
             raise FileNotFoundError(f'Geometry file missing: {path}')
 
-        # Validate STL file by attempting to load it
+        # Validate STL file from its header, the mesh itself is loaded later by the caller
         try:
-            stl_file = stlTools.solidSTL(self.geo_base_path)
+            stlTools.solidSTL.validate(self.geo_base_path)
         except Exception as e:
             raise ValueError(
                 f'droneCFD encountered an error with the STL file: {e}'
@@ -166,6 +325,24 @@ class caseSetup:
         print(f'Geometry set to: {self.stlPath}')
 
 
+@lru_cache(maxsize=None)
+def availableCores() -> int:
+    """
+    Return the number of cores this process may actually run on.
+
+    Uses the scheduler affinity mask where the platform provides one, so cgroup or
+    taskset restricted environments are not oversubscribed, and falls back to
+    multiprocessing.cpu_count() elsewhere. The result is cached.
+
+    Returns:
+        Number of usable cores.
+    """
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return multiprocessing.cpu_count()
+
+
 class parallelUtilities:
     """
     Manages parallel processing configuration for CFD simulations.
@@ -189,7 +366,7 @@ class parallelUtilities:
         """
         if procs is None:
             print('Evaluating computation hardware')
-            self.procs = multiprocessing.cpu_count()
+            self.procs = availableCores()
         else:
             if procs < 1:
                 raise ValueError('Number of processors must be at least 1')
@@ -197,7 +374,7 @@ class parallelUtilities:
             print('Running on user specified number of processors')
             self.procs = procs
 
-            available_cores = multiprocessing.cpu_count()
+            available_cores = availableCores()
             if self.procs > available_cores:
                 print(
                     f'Warning: Requested {self.procs} cores, but only '
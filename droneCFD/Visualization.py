@@ -13,20 +13,100 @@ Functions:
     plot_convergence: Plot residual convergence history.
 """
 
+from __future__ import annotations
+
 __author__ = 'droneCFD Contributors'
 
+import io
+import os
+import importlib.util
+import warnings
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, List, Tuple
+from typing import TYPE_CHECKING, Optional, List, Tuple
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.figure import Figure
 
-try:
-    import plotly.graph_objects as go
-    from plotly.subplots import make_subplots
-    PLOTLY_AVAILABLE = True
-except ImportError:
-    PLOTLY_AVAILABLE = False
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+
+## matplotlib and plotly are only imported when a plot is drawn, so loading forces
+## data from a headless batch run doesn't pay for them
+PLOTLY_AVAILABLE = importlib.util.find_spec('plotly') is not None
+
+## Force histories are thinned to about this many points before plotting
+MAX_PLOT_POINTS = 4000
+
+
+## Agg rendering settings for long force histories. A simplify threshold of 1.0 merges
+## line segments that deviate by less than a pixel, and a nonzero chunksize splits long
+## paths so Agg doesn't stall on them. Both can shift a curve by at most about a pixel.
+RENDER_PARAMS = {
+    'path.simplify': True,
+    'path.simplify_threshold': 1.0,
+    'agg.path.chunksize': 10000,
+}
+
+
+def _read_tail(path: Path, n: int, chunk_size: int = 65536) -> bytes:
+    """
+    Read the last n data lines of a text file, skipping comment (#) and blank lines.
+
+    The file is read backward from EOF in chunk_size blocks until enough lines are
+    found, so the cost does not grow with the length of the file.
+
+    Args:
+        path: File to read.
+        n: Number of data lines wanted.
+        chunk_size: Size of each backward read in bytes.
+
+    Returns:
+        The last n data lines (fewer if the file is shorter), newline separated.
+    """
+    data_lines: List[bytes] = []
+    buf = b''
+    with open(path, 'rb') as fh:
+        pos = fh.seek(0, os.SEEK_END)
+        while pos > 0 and len(data_lines) < n:
+            step = min(chunk_size, pos)
+            pos -= step
+            fh.seek(pos)
+            buf = fh.read(step) + buf
+            lines = buf.splitlines()
+            # Unless the start of the file was reached the first line may be cut off
+            if pos > 0:
+                lines = lines[1:]
+            data_lines = [line for line in lines
+                          if line.strip() and not line.lstrip().startswith(b'#')]
+    return b'\n'.join(data_lines[-n:])
+
+
+@lru_cache(maxsize=None)
+def _pyplot():
+    """
+    Import matplotlib.pyplot on first use and apply RENDER_PARAMS once.
+
+    Returns:
+        The matplotlib.pyplot module.
+    """
+    import matplotlib.pyplot as plt
+    plt.rcParams.update(RENDER_PARAMS)
+    return plt
+
+
+def _plot_slice(n: int, downsample: bool) -> slice:
+    """
+    Return the slice used to thin an n-point time series for plotting.
+
+    Args:
+        n: Number of samples in the series.
+        downsample: Whether to thin the series at all.
+
+    Returns:
+        A strided slice keeping at most about MAX_PLOT_POINTS samples.
+    """
+    if not downsample:
+        return slice(None)
+    return slice(None, None, max(1, n // MAX_PLOT_POINTS))
 
 
 class ResultsVisualizer:
@@ -39,6 +119,11 @@ class ResultsVisualizer:
     Attributes:
         case_path: Path to the OpenFOAM case directory.
         forces_data: Loaded forces data array.
+        time: Contiguous copy of the time column.
+        fx_p, fy_p, fz_p: Contiguous pressure force components.
+        fx_v, fy_v, fz_v: Contiguous viscous force components.
+        drag: Total drag force (fx_p + fx_v).
+        lift: Total lift force (fz_p + fz_v).
     """
 
     def __init__(self, case_path: str | Path) -> None:
@@ -56,13 +141,20 @@ class ResultsVisualizer:
             raise FileNotFoundError(f"Case directory not found: {self.case_path}")
 
         self.forces_data: Optional[np.ndarray] = None
+        self.time: Optional[np.ndarray] = None
+        self.fx_p = self.fy_p = self.fz_p = None
+        self.fx_v = self.fy_v = self.fz_v = None
+        self.drag: Optional[np.ndarray] = None
+        self.lift: Optional[np.ndarray] = None
 
-    def load_forces(self, time_dir: str = "0") -> np.ndarray:
+    def load_forces(self, time_dir: str = "0", tail_n: Optional[int] = None) -> np.ndarray:
         """
         Load forces data from OpenFOAM postProcessing directory.
 
         Args:
             time_dir: Time directory containing forces data (default: "0").
+            tail_n: Only load the last tail_n samples, read backward from the end of
+                the file instead of parsing the whole history (optional).
 
         Returns:
             Numpy array with columns: [time, fx_p, fy_p, fz_p, fx_v, fy_v, fz_v, ...]
@@ -76,33 +168,43 @@ class ResultsVisualizer:
         if not forces_file.exists():
             raise FileNotFoundError(f"Forces file not found: {forces_file}")
 
-        data = []
-        with open(forces_file, 'r') as f:
-            for line in f:
-                # Skip comment lines
-                if line.startswith('#'):
-                    continue
-
-                # Remove parentheses
-                line = line.translate(str.maketrans('', '', '()'))
-                line_data = line.split()
-
-                if len(line_data) >= 10:
-                    try:
-                        data.append(np.array(line_data[:10], dtype='float'))
-                    except ValueError:
-                        continue
-
-        if not data:
+        # Strip the parentheses from the whole file (or its tail) at once and let NumPy
+        # parse it in C
+        text = forces_file.read_bytes() if tail_n is None else _read_tail(forces_file, tail_n)
+        raw = io.BytesIO(text.translate(None, b'()'))
+        with warnings.catch_warnings():
+            # Empty input and skipped rows are reported below, not as warnings
+            warnings.simplefilter('ignore')
+            try:
+                data = np.loadtxt(raw, comments='#', usecols=range(10), ndmin=2)
+            except ValueError:
+                # Truncated or malformed rows, fall back to the tolerant parser and drop them
+                raw.seek(0)
+                data = np.genfromtxt(raw, comments='#', usecols=range(10),
+                                     invalid_raise=False, ndmin=2)
+                data = data[~np.isnan(data).any(axis=1)]
+
+        if len(data) == 0:
             raise ValueError(f"No valid data found in {forces_file}")
 
-        self.forces_data = np.array(data)
+        self.forces_data = data
+
+        # Cache the columns the plots use as contiguous 1-D arrays instead of a strided
+        # column gather in every plot method. All nine rows (seven columns plus the drag
+        # and lift totals) live in one preallocated block filled in place.
+        columns = np.empty((9, len(data)), dtype=data.dtype)
+        columns[:7] = data[:, :7].T
+        np.add(columns[1], columns[4], out=columns[7])
+        np.add(columns[3], columns[6], out=columns[8])
+        (self.time, self.fx_p, self.fy_p, self.fz_p,
+         self.fx_v, self.fy_v, self.fz_v, self.drag, self.lift) = columns
         return self.forces_data
 
     def plot_forces_history(
         self,
         save_path: Optional[str | Path] = None,
-        show: bool = True
+        show: bool = True,
+        downsample: bool = True
     ) -> Figure:
         """
         Plot force history (lift and drag vs time).
@@ -110,6 +212,8 @@ class ResultsVisualizer:
         Args:
             save_path: Path to save the figure (optional).
             show: Whether to display the plot.
+            downsample: Whether to stride long histories down to about
+                MAX_PLOT_POINTS samples before plotting.
 
         Returns:
             Matplotlib Figure object.
@@ -120,11 +224,13 @@ class ResultsVisualizer:
         if self.forces_data is None:
             raise ValueError("Forces data not loaded. Call load_forces() first.")
 
+        plt = _pyplot()
         fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(10, 8))
 
-        time = self.forces_data[:, 0]
-        drag = self.forces_data[:, 1] + self.forces_data[:, 4]  # Pressure + viscous
-        lift = self.forces_data[:, 3] + self.forces_data[:, 6]  # Pressure + viscous
+        sl = _plot_slice(len(self.time), downsample)
+        time = self.time[sl]
+        drag = self.drag[sl]  # Pressure + viscous
+        lift = self.lift[sl]  # Pressure + viscous
 
         # Plot drag
         ax1.plot(time, drag, 'b-', linewidth=2, label='Drag Force')
@@ -156,7 +262,8 @@ class ResultsVisualizer:
     def plot_force_components(
         self,
         save_path: Optional[str | Path] = None,
-        show: bool = True
+        show: bool = True,
+        downsample: bool = True
     ) -> Figure:
         """
         Plot pressure and viscous force components separately.
@@ -164,6 +271,8 @@ class ResultsVisualizer:
         Args:
             save_path: Path to save the figure (optional).
             show: Whether to display the plot.
+            downsample: Whether to stride long histories down to about
+                MAX_PLOT_POINTS samples before plotting.
 
         Returns:
             Matplotlib Figure object.
@@ -174,22 +283,36 @@ class ResultsVisualizer:
         if self.forces_data is None:
             raise ValueError("Forces data not loaded. Call load_forces() first.")
 
+        plt = _pyplot()
         fig, axes = plt.subplots(2, 2, figsize=(14, 10))
 
-        time = self.forces_data[:, 0]
+        sl = _plot_slice(len(self.time), downsample)
+        time = self.time[sl]
 
         # Extract force components
-        fx_pressure = self.forces_data[:, 1]
-        fy_pressure = self.forces_data[:, 2]
-        fz_pressure = self.forces_data[:, 3]
-        fx_viscous = self.forces_data[:, 4]
-        fy_viscous = self.forces_data[:, 5]
-        fz_viscous = self.forces_data[:, 6]
+        fx_pressure = self.fx_p[sl]
+        fy_pressure = self.fy_p[sl]
+        fz_pressure = self.fz_p[sl]
+        fx_viscous = self.fx_v[sl]
+        fy_viscous = self.fy_v[sl]
+        fz_viscous = self.fz_v[sl]
+
+        # Derived series are written into one preallocated buffer with out= ufuncs,
+        # no per-expression temporaries. Drag and lift totals come from load_forces.
+        derived = np.empty((3, len(time)), dtype=time.dtype)
+        fy_total, pressure_fraction, scratch = derived
+        np.add(fy_pressure, fy_viscous, out=fy_total)
+        np.abs(fx_pressure, out=pressure_fraction)
+        np.abs(fx_viscous, out=scratch)
+        scratch += pressure_fraction
+        scratch += 1e-10
+        np.divide(pressure_fraction, scratch, out=pressure_fraction)
+        pressure_fraction *= 100
 
         # Plot X forces (drag)
         axes[0, 0].plot(time, fx_pressure, 'b-', label='Pressure', linewidth=2)
         axes[0, 0].plot(time, fx_viscous, 'r-', label='Viscous', linewidth=2)
-        axes[0, 0].plot(time, fx_pressure + fx_viscous, 'k--', label='Total', linewidth=2)
+        axes[0, 0].plot(time, self.drag[sl], 'k--', label='Total', linewidth=2)
         axes[0, 0].set_xlabel('Time (s)')
         axes[0, 0].set_ylabel('Fx (N)')
         axes[0, 0].set_title('X-Direction Forces (Drag)', fontweight='bold')
@@ -199,7 +322,7 @@ class ResultsVisualizer:
         # Plot Y forces
         axes[0, 1].plot(time, fy_pressure, 'b-', label='Pressure', linewidth=2)
         axes[0, 1].plot(time, fy_viscous, 'r-', label='Viscous', linewidth=2)
-        axes[0, 1].plot(time, fy_pressure + fy_viscous, 'k--', label='Total', linewidth=2)
+        axes[0, 1].plot(time, fy_total, 'k--', label='Total', linewidth=2)
         axes[0, 1].set_xlabel('Time (s)')
         axes[0, 1].set_ylabel('Fy (N)')
         axes[0, 1].set_title('Y-Direction Forces', fontweight='bold')
@@ -209,7 +332,7 @@ class ResultsVisualizer:
         # Plot Z forces (lift)
         axes[1, 0].plot(time, fz_pressure, 'b-', label='Pressure', linewidth=2)
         axes[1, 0].plot(time, fz_viscous, 'r-', label='Viscous', linewidth=2)
-        axes[1, 0].plot(time, fz_pressure + fz_viscous, 'k--', label='Total', linewidth=2)
+        axes[1, 0].plot(time, self.lift[sl], 'k--', label='Total', linewidth=2)
         axes[1, 0].set_xlabel('Time (s)')
         axes[1, 0].set_ylabel('Fz (N)')
         axes[1, 0].set_title('Z-Direction Forces (Lift)', fontweight='bold')
@@ -217,9 +340,7 @@ class ResultsVisualizer:
         axes[1, 0].legend()
 
         # Plot pressure vs viscous ratio
-        total_drag = fx_pressure + fx_viscous
-        pressure_fraction = np.abs(fx_pressure) / (np.abs(fx_pressure) + np.abs(fx_viscous) + 1e-10)
-        axes[1, 1].plot(time, pressure_fraction * 100, 'g-', linewidth=2)
+        axes[1, 1].plot(time, pressure_fraction, 'g-', linewidth=2)
         axes[1, 1].set_xlabel('Time (s)')
         axes[1, 1].set_ylabel('Pressure Drag Fraction (%)')
         axes[1, 1].set_title('Pressure vs Viscous Drag Ratio', fontweight='bold')
@@ -258,6 +379,7 @@ def plot_aoa_sweep(
     Returns:
         Matplotlib Figure object.
     """
+    plt = _pyplot()
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
 
     # Lift curve
@@ -312,6 +434,7 @@ def plot_drag_polar(
     Returns:
         Matplotlib Figure object.
     """
+    plt = _pyplot()
     fig, ax = plt.subplots(figsize=(10, 8))
 
     ax.plot(drag_list, lift_list, 'go-', linewidth=2, markersize=8, label='Drag Polar')
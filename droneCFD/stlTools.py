@@ -21,12 +21,74 @@ Classes:
 __author__ = 'chrispaulson'
 
 import os
+import struct
 from pathlib import Path
 from typing import List, Tuple, Literal, Optional
 import math
 import numpy as np
 from stl import stl as stl
-from functools import reduce
+from stl import mesh as stlMesh
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _applyRotation(v, rm):
+        """Rotate an (N, 3, 3) vertex array in place, one triangle per parallel iteration."""
+        for i in prange(v.shape[0]):
+            for j in range(3):
+                x = v[i, j, 0]
+                y = v[i, j, 1]
+                z = v[i, j, 2]
+                v[i, j, 0] = rm[0, 0] * x + rm[0, 1] * y + rm[0, 2] * z
+                v[i, j, 1] = rm[1, 0] * x + rm[1, 1] * y + rm[1, 2] * z
+                v[i, j, 2] = rm[2, 0] * x + rm[2, 1] * y + rm[2, 2] * z
+
+    @njit(cache=True)
+    def _boundingBox(v):
+        """Per-axis min/max and the (triangle, vertex) indices of the Y extremes, in one pass."""
+        mins = v[0, 0].astype(np.float64)
+        maxs = mins.copy()
+        imin = (0, 0)
+        imax = (0, 0)
+        for i in range(v.shape[0]):
+            for j in range(3):
+                for c in range(3):
+                    val = v[i, j, c]
+                    if val < mins[c]:
+                        mins[c] = val
+                        if c == 1:
+                            imin = (i, j)
+                    if val > maxs[c]:
+                        maxs[c] = val
+                        if c == 1:
+                            imax = (i, j)
+        return mins, maxs, imin, imax
+
+
+def _binaryTriangleCount(fp: Path) -> Optional[int]:
+    """
+    Read the triangle count of a binary STL from its 84-byte header.
+
+    Args:
+        fp: File path to the STL file.
+
+    Returns:
+        The triangle count if the file size matches the binary layout exactly
+        (84 + 50 bytes per triangle), otherwise None.
+    """
+    with open(fp, 'rb') as fh:
+        header = fh.read(84)
+    if len(header) < 84:
+        return None
+    ntri = struct.unpack('<I', header[80:84])[0]
+    if fp.stat().st_size != 84 + 50 * ntri:
+        return None
+    return ntri
 
 
 class solidSTL:
@@ -42,6 +104,10 @@ class solidSTL:
         bb: Bounding box coordinates [xmin, xmax, ymin, ymax, zmin, zmax].
         ymaxPoint: Coordinates of the maximum Y point (typically a wingtip).
         yminPoint: Coordinates of the minimum Y point (typically opposite wingtip).
+            bb and the extreme points are recomputed lazily, on the first read after
+            a scale or rotation.
+        modified: Whether the vertices have been transformed since the file was loaded,
+            including by the centering done on load.
     """
 
     def __init__(self, fp: str | Path) -> None:
@@ -62,40 +128,105 @@ class solidSTL:
         print(f'Loading STL file: {fp}')
 
         try:
-            self.mesh = stl.StlMesh(str(fp))
+            ntri = _binaryTriangleCount(fp)
+            if ntri is not None:
+                # Binary STL, read the fixed 50-byte records straight into the mesh dtype
+                # in one call. Normals are recomputed on save, so they are not derived here.
+                data = np.fromfile(fp, dtype=stlMesh.Mesh.dtype, count=ntri, offset=84)
+                self.mesh = stlMesh.Mesh(data, calculate_normals=False, name=fp.stem)
+            else:
+                self.mesh = stl.StlMesh(str(fp))
         except Exception as e:
             raise ValueError(f"Failed to load STL file {fp}: {e}") from e
 
-        self.boundingBox()
+        self.modified = False
+        self._bbDirty = True
         self.centerGeometry()
 
+    @classmethod
+    def validate(cls, fp: str | Path) -> None:
+        """
+        Check that a file is a readable STL without loading its triangles.
+
+        Binary STLs are validated from the 84-byte header alone: the triangle count
+        must account for the file size exactly (84 + 50 bytes per triangle). Files
+        that do not match the binary layout are treated as ASCII and parsed in full.
+
+        Args:
+            fp: File path to the STL file to check.
+
+        Raises:
+            FileNotFoundError: If the STL file doesn't exist.
+            ValueError: If the STL file is invalid or corrupted.
+        """
+        fp = Path(fp)
+        if not fp.is_file():
+            raise FileNotFoundError(f"STL file not found: {fp}")
+
+        if _binaryTriangleCount(fp) is not None:
+            return
+
+        with open(fp, 'rb') as fh:
+            header = fh.read(84)
+        if not header.lstrip().startswith(b'solid'):
+            raise ValueError(f"Failed to load STL file {fp}: not a binary or ASCII STL")
+        try:
+            stl.StlMesh(str(fp))
+        except Exception as e:
+            raise ValueError(f"Failed to load STL file {fp}: {e}") from e
+
     def boundingBox(self) -> None:
         """
         Calculate and store the bounding box of the mesh.
 
         Updates the bb attribute with [xmin, xmax, ymin, ymax, zmin, zmax]
         and identifies the extreme Y-coordinate points (typically wingtips).
+        Called automatically when bb is read after the mesh has changed.
         """
-        xmin = float(self.mesh.x.min())
-        xmax = float(self.mesh.x.max())
-        ymin = float(self.mesh.y.min())
-        ymax = float(self.mesh.y.max())
-        zmin = float(self.mesh.z.min())
-        zmax = float(self.mesh.z.max())
-        self.bb = [xmin, xmax, ymin, ymax, zmin, zmax]
-
-        # Find the actual points at the extremes (typically wingtips)
-        where = np.where(self.mesh.data['vectors'] == ymax)
-        if len(where[0]) > 0:
-            self.ymaxPoint = self.mesh.data['vectors'][where[0][0]][where[1][0]]
-        else:
-            self.ymaxPoint = np.array([0.0, ymax, 0.0])
-
-        where = np.where(self.mesh.data['vectors'] == ymin)
-        if len(where[0]) > 0:
-            self.yminPoint = self.mesh.data['vectors'][where[0][0]][where[1][0]]
+        verts = self.mesh.data['vectors']
+        if NUMBA_AVAILABLE:
+            # The vertices are a strided view into the 50-byte STL records, so walk them
+            # in place in a single pass instead of copying them into a flat array
+            mins, maxs, imin, imax = _boundingBox(verts)
+            ymaxPoint = verts[imax]
+            yminPoint = verts[imin]
         else:
-            self.yminPoint = np.array([0.0, ymin, 0.0])
+            # One min and one max pass over all vertices instead of one per axis
+            flat = verts.reshape(-1, 3)
+            mins = flat.min(axis=0)
+            maxs = flat.max(axis=0)
+            ycol = flat[:, 1]
+            ymaxPoint = flat[ycol.argmax()]
+            yminPoint = flat[ycol.argmin()]
+        xmin, ymin, zmin = (float(v) for v in mins)
+        xmax, ymax, zmax = (float(v) for v in maxs)
+        self._bb = [xmin, xmax, ymin, ymax, zmin, zmax]
+
+        # The actual points at the extremes (typically wingtips)
+        self._ymaxPoint = ymaxPoint.copy()
+        self._yminPoint = yminPoint.copy()
+        self._bbDirty = False
+
+    @property
+    def bb(self) -> List[float]:
+        """Bounding box [xmin, xmax, ymin, ymax, zmin, zmax], rescanned only after changes."""
+        if self._bbDirty:
+            self.boundingBox()
+        return self._bb
+
+    @property
+    def ymaxPoint(self) -> np.ndarray:
+        """Vertex with the largest Y coordinate."""
+        if self._bbDirty:
+            self.boundingBox()
+        return self._ymaxPoint
+
+    @property
+    def yminPoint(self) -> np.ndarray:
+        """Vertex with the smallest Y coordinate."""
+        if self._bbDirty:
+            self.boundingBox()
+        return self._yminPoint
 
     def translate(self, dx: float = 0.0, dy: float = 0.0, dz: float = 0.0) -> None:
         """
@@ -106,8 +237,22 @@ class solidSTL:
             dy: Translation distance in Y direction (meters).
             dz: Translation distance in Z direction (meters).
         """
-        self.mesh.data['vectors'] = self.mesh.data['vectors'] + [dx, dy, dz]
-        self.boundingBox()  # Update bounding box after translation
+        if dx == 0.0 and dy == 0.0 and dz == 0.0:
+            return  # Identity, skip the pass over the mesh
+
+        # In place and in the mesh dtype (float32), no float64 temporary
+        verts = self.mesh.data['vectors']
+        verts += np.array([dx, dy, dz], dtype=verts.dtype)
+        self.modified = True
+
+        # A translation shifts a current bounding box and extreme points rigidly, no rescan
+        # needed. A stale one is left for the next read to recompute.
+        if not self._bbDirty:
+            bb = self._bb
+            self._bb = [bb[0] + dx, bb[1] + dx, bb[2] + dy, bb[3] + dy, bb[4] + dz, bb[5] + dz]
+            offset = np.array([dx, dy, dz])
+            self._ymaxPoint = self._ymaxPoint + offset
+            self._yminPoint = self._yminPoint + offset
 
     def centerGeometry(self) -> None:
         """
@@ -115,8 +260,8 @@ class solidSTL:
 
         This method translates the mesh so that its center coincides with
         the coordinate system origin, which is useful for CFD simulations.
+        The bounding box is recomputed first if a transform left it stale.
         """
-        self.boundingBox()
         dx = self.bb[1] - self.bb[0]
         dy = self.bb[3] - self.bb[2]
         dz = self.bb[5] - self.bb[4]
@@ -137,15 +282,21 @@ class solidSTL:
         """
         if x <= 0 or y <= 0 or z <= 0:
             raise ValueError("Scale factors must be positive")
-        self.mesh.data['vectors'] = self.mesh.data['vectors'] * [x, y, z]
-        self.boundingBox()  # Update bounding box after scaling
-
-    def save(self, fp: str | Path) -> None:
+        if x == 1.0 and y == 1.0 and z == 1.0:
+            return  # Identity, skip the pass over the mesh and the bounding box update
+        verts = self.mesh.data['vectors']
+        verts *= np.array([x, y, z], dtype=verts.dtype)
+        self.modified = True
+        self._bbDirty = True  # Bounding box is recomputed on the next read
+
+    def save(self, fp: str | Path, mode: stl.Mode = stl.Mode.BINARY) -> None:
         """
         Save the mesh to an STL file.
 
         Args:
             fp: File path where the STL file should be saved.
+            mode: STL format to write, binary by default since it is several times
+                smaller and faster to read back than ASCII.
 
         Raises:
             IOError: If the file cannot be written.
@@ -158,7 +309,7 @@ class solidSTL:
 
         try:
             with open(fp, 'wb') as fh:
-                self.mesh.save(fp, fh=fh, mode=2, update_normals=True)
+                self.mesh.save(fp, fh=fh, mode=mode, update_normals=True)
             print(f'Successfully saved STL file: {fp}')
         except Exception as e:
             raise IOError(f"Failed to save STL file {fp}: {e}") from e
@@ -200,15 +351,27 @@ class solidSTL:
             pass  # Already in radians
         else:
             raise ValueError(f"Invalid units: {units}. Must be 'degrees' or 'radians'")
+        if x == 0.0 and y == 0.0 and z == 0.0:
+            return  # Identity, e.g. the 0 degree case of an AoA sweep
 
         rm = self.euler2mat(z, y, x)
 
-        # Apply rotation to all vertices
-        for i in range(self.mesh.data['vectors'].shape[0]):
-            for j in range(3):  # Each triangle has 3 vertices
-                self.mesh.data['vectors'][i][j] = np.dot(self.mesh.data['vectors'][i][j], rm.T)
+        # Apply rotation to all vertices in place, with a fused parallel kernel when Numba
+        # is available and one batched (N, 3, 3) @ (3, 3) matmul otherwise. The matrix
+        # is cast to the mesh dtype (float32) so no float64 copy is made.
+        verts = self.mesh.data['vectors']
+        rm = rm.astype(verts.dtype)
+        if NUMBA_AVAILABLE:
+            _applyRotation(verts, rm)
+        else:
+            np.matmul(verts, rm.T, out=verts)
+
+        # Keep the facet normals consistent with the rotated vertices (N x 3, one matmul)
+        normals = self.mesh.data['normals']
+        np.matmul(normals, rm.T, out=normals)
+        self.modified = True
 
-        self.boundingBox()  # Update bounding box after rotation
+        self._bbDirty = True  # Bounding box is recomputed on the next read
 
     def euler2mat(self, z: float = 0.0, y: float = 0.0, x: float = 0.0) -> np.ndarray:
         """
@@ -222,42 +385,15 @@ class solidSTL:
         Returns:
             3x3 rotation matrix as numpy array.
         """
-        Ms = []
-
-        # Z rotation (yaw)
-        if z != 0:
-            cosz = math.cos(z)
-            sinz = math.sin(z)
-            Ms.append(np.array([
-                [cosz, -sinz, 0],
-                [sinz, cosz, 0],
-                [0, 0, 1]
-            ]))
-
-        # Y rotation (pitch)
-        if y != 0:
-            cosy = math.cos(y)
-            siny = math.sin(y)
-            Ms.append(np.array([
-                [cosy, 0, siny],
-                [0, 1, 0],
-                [-siny, 0, cosy]
-            ]))
-
-        # X rotation (roll)
-        if x != 0:
-            cosx = math.cos(x)
-            sinx = math.sin(x)
-            Ms.append(np.array([
-                [1, 0, 0],
-                [0, cosx, -sinx],
-                [0, sinx, cosx]
-            ]))
-
-        # Combine rotation matrices
-        if Ms:
-            return reduce(np.dot, Ms[::-1])
-        return np.eye(3)
+        # Closed form of Rx @ Ry @ Rz, zero angles give exact cos=1/sin=0 terms
+        cz, sz = math.cos(z), math.sin(z)
+        cy, sy = math.cos(y), math.sin(y)
+        cx, sx = math.cos(x), math.sin(x)
+        return np.array([
+            [cy * cz, -cy * sz, sy],
+            [cx * sz + sx * sy * cz, cx * cz - sx * sy * sz, -sx * cy],
+            [sx * sz - cx * sy * cz, sx * cz + cx * sy * sz, cx * cy]
+        ])
 
     def getWingtip(self) -> np.ndarray:
         """
@@ -24,8 +24,133 @@ Updated for Python 3.12+
 ##                                                                                      ##
 ##########################################################################################
 
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from droneCFD import Utilities, stlTools, Meshing, Solver, Visualization
+
+# BLAS sizes its thread pool when NumPy is first imported, and forked sweep workers inherit
+# it, so cap it before the import. Otherwise every worker starts one thread per core.
+BLAS_THREAD_VARS = ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS')
+for _var in BLAS_THREAD_VARS:
+    os.environ.setdefault(_var, '1')
+
+import numpy as np  # noqa: E402
+from droneCFD import Utilities, stlTools, Meshing, Solver  # noqa: E402
+
+
+def _init_worker(core_slots, threads_per_case):
+    """Pin a sweep worker process to its own slice of cores and size its thread pools to it."""
+    for var in BLAS_THREAD_VARS:
+        os.environ[var] = str(threads_per_case)
+    cores = core_slots.get()
+    if hasattr(os, 'sched_setaffinity'):
+        os.sched_setaffinity(0, cores)
+
+    # Pools that are already running (inherited through fork) have to be resized in place
+    try:
+        from threadpoolctl import threadpool_limits
+        threadpool_limits(threads_per_case)
+    except ImportError:
+        pass
+    if stlTools.NUMBA_AVAILABLE:
+        import numba
+        numba.set_num_threads(min(threads_per_case, numba.config.NUMBA_NUM_THREADS))
+
+
+def build_mesh(case, aoa, nprocs):
+    """
+    Rotate the case geometry to an angle of attack and mesh it.
+
+    Args:
+        case: Utilities.caseSetup of the case to mesh.
+        aoa: Angle of attack (degrees).
+        nprocs: Number of MPI ranks used by the mesher.
+
+    Returns:
+        The Meshing.mesher used for the case.
+    """
+    # Load and rotate geometry
+    print(f"[AOA {aoa}°] Configuring geometry")
+    model = stlTools.solidSTL(case.stlPath)
+    model.setaoa(aoa, units='degrees')
+    # setaoa(0) is a no-op, so an already centered geometry at 0° needs no rewrite
+    if model.modified:
+        model.save(case.stlPath)
+
+    # Generate mesh
+    print(f"[AOA {aoa}°] Generating mesh")
+    mesh = Meshing.mesher(case.dir, model, nprocs=nprocs)
+    mesh.blockMesh()
+    # Parallel snappyHexMesh once the case has enough cores to amortise decompose/reconstruct
+    mesh.snappyHexMesh(
+        parallel=nprocs >= Meshing.MIN_PARALLEL_SNAPPY_PROCS,
+        nprocs=nprocs
+    )
+    return mesh
+
+
+def run_one_aoa(aoa, base_path, geometry_path, threads_per_case, preview=False):
+    """
+    Set up, mesh and solve one angle of attack case.
+
+    Args:
+        aoa: Angle of attack (degrees).
+        base_path: Directory holding all sweep cases.
+        geometry_path: Path to the STL geometry, None for the benchmark aircraft.
+        threads_per_case: Number of MPI ranks used by the mesher and solver.
+        preview: Open ParaView on the meshed and solved case once it has finished.
+
+    Returns:
+        Tuple of (aoa, lift_avg, drag_avg), with None forces if extraction failed.
+    """
+    # Setup case directory
+    case_name = str(Path(base_path) / f'test_{aoa}')
+    print(f"[AOA {aoa}°] Setting up case: {case_name}")
+    # Template files are hardlinked, the ones the run rewrites are still copied
+    case = Utilities.caseSetup(
+        folderPath=case_name,
+        geometryPath=geometry_path,
+        copyFunction=os.link
+    )
+
+    mesh = build_mesh(case, aoa, threads_per_case)
+
+    # Run solver
+    print(f"[AOA {aoa}°] Running solver")
+    solver = Solver.solver(case.dir, nprocs=threads_per_case)
+
+    # One ParaView launch per case, after the solve, showing both the mesh and the results
+    if preview:
+        mesh.previewMesh()
+
+    # Extract results, importing the plotting module only once a case has finished
+    try:
+        from droneCFD import Visualization
+        viz = Visualization.ResultsVisualizer(case.dir)
+        forces = viz.load_forces(tail_n=15)
+
+        # Get time-averaged forces from last 15 iterations, one mean over the
+        # pressure/viscous drag (fx) and lift (fz) columns of the tail
+        avg_length = min(15, len(forces))
+        m = forces[-avg_length:, (1, 4, 3, 6)].mean(axis=0)
+        drag_avg = float(m[0] + m[1])  # Pressure + viscous
+        lift_avg = float(m[2] + m[3])  # Pressure + viscous
+
+        print(f"[AOA {aoa}°] ✓ Lift: {lift_avg:.3f} N, Drag: {drag_avg:.3f} N")
+    except Exception as e:
+        print(f"[AOA {aoa}°] ⚠ Could not extract forces: {e}")
+        drag_avg = None
+        lift_avg = None
+
+    return aoa, lift_avg, drag_avg
+
+
+def record_result(results_fh, aoa, lift_avg, drag_avg):
+    """Append one finished case to the results CSV and force it to disk."""
+    results_fh.write(f"{aoa},{lift_avg},{drag_avg}\n")
+    results_fh.flush()
+    os.fsync(results_fh.fileno())
 
 
 def main():
@@ -36,76 +161,91 @@ def main():
     base_path = 'sweep'
     aoa_range = [-6, -4, -2, 0, 2, 4, 6, 8, 10]  # degrees
     geometry_path = None  # Use default benchmark aircraft
+    threads_per_case = 2  # Cores given to each case, the rest run other cases concurrently
+
+    # Spread the cores evenly over concurrent cases, each worker on its own core slice
+    cores = sorted(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') \
+        else list(range(os.cpu_count() or 1))
+    threads_per_case = max(1, min(threads_per_case, len(cores)))
+    n_cases = len(aoa_range)
+    n_workers = max(1, min(n_cases, len(cores) // threads_per_case))
+    base = Path(base_path)
+    base.mkdir(parents=True, exist_ok=True)
 
     print("=" * 70)
     print("droneCFD - Angle of Attack Sweep")
     print("=" * 70)
     print(f"AOA Range: {aoa_range}")
-    print(f"Number of simulations: {len(aoa_range)}")
+    print(f"Number of simulations: {n_cases}")
+    print(f"Concurrent cases: {n_workers} x {threads_per_case} cores")
     print(f"Results directory: {base_path}")
     print("=" * 70)
 
-    # Storage for results
-    lift_values = []
-    drag_values = []
-
-    # Run simulations for each angle of attack
-    for i, aoa in enumerate(aoa_range, 1):
-        print(f"\n{'=' * 70}")
-        print(f"Simulation {i}/{len(aoa_range)}: AOA = {aoa}°")
-        print(f"{'=' * 70}")
-
-        # Setup case directory
-        case_name = f'{base_path}/test_{aoa}'
-        print(f"\n[1/4] Setting up case: {case_name}")
-        case = Utilities.caseSetup(
-            folderPath=case_name,
-            geometryPath=geometry_path
-        )
-
-        # Load and rotate geometry
-        print(f"[2/4] Configuring geometry at {aoa}° AOA")
-        model = stlTools.solidSTL(case.stlPath)
-        model.setaoa(aoa, units='degrees')
-        model.save(case.stlPath)
-
-        # Generate mesh
-        print("[3/4] Generating mesh")
-        mesh = Meshing.mesher(case.dir, model)
-        mesh.blockMesh()
-        mesh.snappyHexMesh()
+    # Storage for results, filled by sweep index regardless of completion order
+    lift_values = np.zeros(n_cases)
+    drag_values = np.zeros(n_cases)
+    index = {aoa: k for k, aoa in enumerate(aoa_range)}
 
-        if preview:
-            mesh.previewMesh()
+    # Every finished case is appended to results.csv straight away, so an interrupted sweep
+    # resumes with the remaining angles only. Delete a row to rerun that angle.
+    results_path = base / 'results.csv'
+    done = set()
+    if results_path.exists():
+        for aoa, lift_avg, drag_avg in np.loadtxt(results_path, delimiter=',', skiprows=1, ndmin=2):
+            if aoa in index:
+                lift_values[index[aoa]] = lift_avg
+                drag_values[index[aoa]] = drag_avg
+                done.add(aoa)
+        print(f"Resuming sweep, {len(done)} of {n_cases} cases already in {results_path}")
+    pending = [aoa for aoa in aoa_range if aoa not in done]
 
-        # Run solver
-        print("[4/4] Running solver")
-        solver = Solver.solver(case.dir)
+    with open(results_path, 'a') as results_fh:
+        if results_fh.tell() == 0:
+            results_fh.write("aoa,lift,drag\n")
 
-        if preview:
-            mesh.previewMesh()
+        def finish(aoa, lift_avg, drag_avg):
+            """Store a finished case. Failed cases stay at zero and out of results.csv, so a resume reruns them."""
+            if lift_avg is None:
+                print(f"✗ AOA {aoa}° failed, it will be rerun on resume")
+                return
+            lift_values[index[aoa]] = lift_avg
+            drag_values[index[aoa]] = drag_avg
+            record_result(results_fh, aoa, lift_avg, drag_avg)
 
-        # Extract results
-        try:
-            viz = Visualization.ResultsVisualizer(case.dir)
-            forces = viz.load_forces()
+        # Run simulations for each angle of attack, preview needs an interactive serial run
+        if n_workers == 1 or preview:
+            for aoa in pending:
+                # Only the final case of the sweep opens ParaView
+                try:
+                    finish(*run_one_aoa(aoa, base, geometry_path, threads_per_case,
+                                        preview and aoa == pending[-1]))
+                except Exception as e:
+                    print(f"[AOA {aoa}°] ⚠ Case failed: {e}")
+                    finish(aoa, None, None)
+        elif pending:
+            with multiprocessing.Manager() as manager:
+                core_slots = manager.Queue()
+                for w in range(n_workers):
+                    core_slots.put(set(cores[w * threads_per_case:(w + 1) * threads_per_case]))
 
-            # Get time-averaged forces from last 15 iterations
-            avg_length = min(15, len(forces))
-            drag = forces[-avg_length:, 1] + forces[-avg_length:, 4]  # Pressure + viscous
-            lift = forces[-avg_length:, 3] + forces[-avg_length:, 6]  # Pressure + viscous
-
-            drag_avg = float(drag.mean())
-            lift_avg = float(lift.mean())
-
-            drag_values.append(drag_avg)
-            lift_values.append(lift_avg)
-
-            print(f"  ✓ Lift: {lift_avg:.3f} N, Drag: {drag_avg:.3f} N")
-        except Exception as e:
-            print(f"  ⚠ Could not extract forces: {e}")
-            drag_values.append(0.0)
-            lift_values.append(0.0)
+                with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker,
+                                         initargs=(core_slots, threads_per_case)) as executor:
+                    futures = {executor.submit(run_one_aoa, aoa, base, geometry_path, threads_per_case): aoa
+                               for aoa in pending}
+                    try:
+                        # A failed case is reported and the sweep carries on recording the rest
+                        for i, future in enumerate(as_completed(futures), len(done) + 1):
+                            aoa = futures[future]
+                            try:
+                                finish(*future.result())
+                            except Exception as e:
+                                print(f"[AOA {aoa}°] ⚠ Case failed: {e}")
+                                finish(aoa, None, None)
+                            print(f"Completed {i}/{n_cases}: AOA = {aoa}°")
+                    except BaseException:
+                        # Interrupted, don't start the cases that are still queued
+                        executor.shutdown(wait=False, cancel_futures=True)
+                        raise
 
     # Generate summary plots
     print(f"\n{'=' * 70}")
@@ -113,12 +253,14 @@ def main():
     print(f"{'=' * 70}")
 
     try:
+        from droneCFD import Visualization
+
         # Lift and drag curves
         Visualization.plot_aoa_sweep(
             aoa_range,
             lift_values,
             drag_values,
-            save_path=f'{base_path}/aoa_sweep.png',
+            save_path=base / 'aoa_sweep.png',
             show=False
         )
         print(f"  ✓ AOA sweep plot saved to: {base_path}/aoa_sweep.png")
@@ -128,7 +270,7 @@ def main():
             lift_values,
             drag_values,
             aoa_list=aoa_range,
-            save_path=f'{base_path}/drag_polar.png',
+            save_path=base / 'drag_polar.png',
             show=False
         )
         print(f"  ✓ Drag polar saved to: {base_path}/drag_polar.png")
@@ -143,8 +285,9 @@ def main():
     print(f"{'AOA (°)':>10} {'Lift (N)':>12} {'Drag (N)':>12} {'L/D':>10}")
     print("-" * 70)
 
-    for aoa, lift, drag in zip(aoa_range, lift_values, drag_values):
-        ld_ratio = lift / drag if drag != 0 else 0
+    # L/D for the whole sweep at once, zero where the drag is zero (failed extraction)
+    ld_ratios = np.divide(lift_values, drag_values, out=np.zeros(n_cases), where=drag_values != 0)
+    for aoa, lift, drag, ld_ratio in zip(aoa_range, lift_values, drag_values, ld_ratios):
         print(f"{aoa:>10.1f} {lift:>12.3f} {drag:>12.3f} {ld_ratio:>10.2f}")
 
     print("=" * 70)
@@ -22,7 +22,7 @@ Updated for Python 3.12+
 ##                                                                                      ##
 ##########################################################################################
 
-from droneCFD import Utilities, stlTools, Meshing, Solver, Visualization
+from droneCFD import Utilities, stlTools, Meshing, Solver
 
 
 def main():
@@ -32,6 +32,7 @@ def main():
     preview = False  # Set to True to open ParaView for visualization
     angle_of_attack = 5.0  # degrees
     case_name = 'test'
+    mesh_procs = min(8, Utilities.availableCores())  # MPI ranks for snappyHexMesh
 
     print("=" * 70)
     print("droneCFD - Single Run Example")
@@ -46,7 +47,9 @@ def main():
     print(f"\n[2/5] Loading geometry and setting angle of attack to {angle_of_attack}°")
     model = stlTools.solidSTL(case.stlPath)
     model.setaoa(angle_of_attack, units='degrees')
-    model.save(case.stlPath)
+    # setaoa(0) is a no-op, so an already centered geometry at 0° needs no rewrite
+    if model.modified:
+        model.save(case.stlPath)
     print(f"  ✓ Geometry configured")
     print(f"  ✓ Bounding box: {model.bb}")
 
@@ -59,13 +62,12 @@ def main():
     print("  ✓ Block mesh generated")
 
     print("  → Running snappyHexMesh...")
-    mesh.snappyHexMesh()
+    mesh.snappyHexMesh(
+        parallel=mesh_procs >= Meshing.MIN_PARALLEL_SNAPPY_PROCS,
+        nprocs=mesh_procs
+    )
     print("  ✓ Refined mesh generated")
 
-    if preview:
-        print("  → Opening ParaView for mesh inspection...")
-        mesh.previewMesh()
-
     # Step 4: Run solver
     print("\n[4/5] Running OpenFOAM solver")
     solver = Solver.solver(case.dir)
@@ -74,6 +76,8 @@ def main():
     # Step 5: Visualize results
     print("\n[5/5] Post-processing results")
     try:
+        # Imported here so meshing and solving don't pay for the plotting stack
+        from droneCFD import Visualization
         viz = Visualization.ResultsVisualizer(case.dir)
         viz.load_forces()
         viz.plot_forces_history(save_path=f'{case.dir}/forces_history.png', show=False)
@@ -83,7 +87,7 @@ def main():
         print(f"  ⚠ Visualization failed: {e}")
 
     if preview:
-        print("  → Opening ParaView for results inspection...")
+        print("  → Opening ParaView for mesh and results inspection...")
         mesh.previewMesh()
 
     print("\n" + "=" * 70)
@@ -2,21 +2,10 @@
 
 __author__ = 'cpaulson'
 
-from setuptools import setup, find_packages
+from setuptools import setup
 from pathlib import Path
 
 here = Path(__file__).parent.absolute()
-datadir = Path('droneCFD/data')
-
-# Collect all data files
-data_files = []
-if datadir.exists():
-    for root, folders, files in datadir.walk():
-        for file in files:
-            filepath = root / file
-            data_files.append(str(filepath.relative_to(datadir)))
-
-print(f"Package data files: {data_files}")
 
 setup(
     name='droneCFD',
@@ -48,9 +37,12 @@ setup(
         'PyFoam>=2022.9',
         'matplotlib>=3.8.0',
     ],
-    packages=find_packages(),
+    # Listed explicitly so setup doesn't walk the template tree looking for packages
+    packages=['droneCFD', 'droneCFD.data'],
     zip_safe=False,
-    package_data={"droneCFD.data": data_files},
+    # The data tree is matched by setuptools' own globbing (and MANIFEST.in for sdists)
+    include_package_data=True,
+    package_data={"droneCFD.data": ["**/*"]},
     scripts=[
         'scripts/dcCheck',
         'scripts/dcRun',